@@ -1,5 +1,7 @@
+from hw_nv.batch_sampler.bucketing_sampler import BucketingSampler
 from hw_nv.batch_sampler.group_sort_batch_sampler import GroupLengthBatchSampler
 
 __all__ = [
+    "BucketingSampler",
     "GroupLengthBatchSampler"
 ]
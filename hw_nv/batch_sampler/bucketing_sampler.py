@@ -0,0 +1,36 @@
+import random
+
+from torch.utils.data import Sampler
+
+
+class BucketingSampler(Sampler):
+    """
+    Batch sampler that groups items of similar audio length together.
+
+    BaseDataset keeps its index sorted by audio length, so consecutive
+    indices already have similar durations. We cut the sorted order into
+    buckets of ``batch_size * bucket_size_multiplier`` items, shuffle
+    inside each bucket and shuffle the resulting batches, which keeps
+    randomness while ensuring the rounded-up batch max length (see
+    collate_fn) does not dwarf the shortest element of the batch.
+    """
+
+    def __init__(self, data_source, batch_size, bucket_size_multiplier=50):
+        super().__init__(data_source)
+        self.data_source = data_source
+        self.batch_size = batch_size
+        self.bucket_size = batch_size * bucket_size_multiplier
+
+    def __iter__(self):
+        indices = list(range(len(self.data_source)))
+        batches = []
+        for bucket_start in range(0, len(indices), self.bucket_size):
+            bucket = indices[bucket_start:bucket_start + self.bucket_size]
+            random.shuffle(bucket)
+            for i in range(0, len(bucket), self.batch_size):
+                batches.append(bucket[i:i + self.batch_size])
+        random.shuffle(batches)
+        return iter(batches)
+
+    def __len__(self):
+        return (len(self.data_source) + self.batch_size - 1) // self.batch_size
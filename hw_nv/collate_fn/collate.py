@@ -1,13 +1,18 @@
 import torch
-import torch.nn.functional as F
 
-from hw_nv.preprocessing.mel_spectrogram import MelSpectrogram
+from hw_nv.preprocessing.mel_spectrogram import MelSpectrogram, MelSpectrogramConfig
 
 import logging
 from typing import List
 
 logger = logging.getLogger(__name__)
 
+MEL_FRAME_MULTIPLE = 32
+# padded audio yields exactly length // hop_length mel frames, so rounding
+# the audio length to hop_length * 32 keeps the mel time axis a multiple
+# of 32 as well and the two paddings never drift apart
+AUDIO_LENGTH_MULTIPLE = MelSpectrogramConfig.hop_length * MEL_FRAME_MULTIPLE
+
 
 def collate_fn(dataset_items: List[dict]):
     """
@@ -17,26 +22,31 @@ def collate_fn(dataset_items: List[dict]):
     result_batch = {}
     wave2spec = MelSpectrogram()
 
+    batch_size = len(dataset_items)
     audio_max_length = max(item['audio'].size(1) for item in dataset_items)
-
-    result_batch['audio_gt'] = []
+    if batch_size > 1:
+        # round up so cudnn benchmark / kernel-selection caches see a small
+        # fixed set of shapes instead of a new one every batch; single-item
+        # batches (inference in test.py) keep the source length, otherwise
+        # the generator would vocode the padding mel frames into an audible
+        # synthesized tail on every saved file
+        audio_max_length = (audio_max_length + AUDIO_LENGTH_MULTIPLE - 1) \
+            // AUDIO_LENGTH_MULTIPLE * AUDIO_LENGTH_MULTIPLE
+
+    # Deliberately unpinned: collate_fn runs in DataLoader worker processes,
+    # where pinned allocation would make a CUDA call; the loader's
+    # pin_memory=True pins the batch in the main process instead.
+    # Filled as (B, T) so the mel transform consumes it directly; audio_gt
+    # gets its channel dim back through an unsqueeze view, not a copy.
+    audio = torch.zeros(batch_size, audio_max_length)
     result_batch['audio_path'] = []
-    spectrograms = []
-
-    for elem in dataset_items:
-        wave_current_length = elem['audio'].shape[1]
-        wave_padding_needed = audio_max_length - wave_current_length
-        padding_tensor = torch.zeros(1, wave_padding_needed)
-        wave_padded = torch.cat((elem['audio'], padding_tensor), dim=1)
-        result_batch['audio_gt'].append(wave_padded)
+    for i, elem in enumerate(dataset_items):
+        audio[i, :elem['audio'].size(1)].copy_(elem['audio'][0])
         result_batch['audio_path'].append(elem['audio_path'])
-        with torch.no_grad():
-            audio_spectrogram = wave2spec(wave_padded)
-        spectrograms.append(audio_spectrogram)
-
-    result_batch['audio_gt'] = torch.stack(result_batch['audio_gt'])
+    result_batch['audio_gt'] = audio.unsqueeze(1)
 
-    max_time = max(spec.shape[-1] for spec in spectrograms)
-    padded_spectrograms = [F.pad(spec, (0, max_time - spec.shape[-1])) for spec in spectrograms]
-    result_batch["mel"] = torch.stack(padded_spectrograms).squeeze(1)
+    # every row is padded to the same length, so one batched call replaces
+    # N per-row transforms plus the buffer they had to be gathered into
+    with torch.no_grad():
+        result_batch['mel'] = wave2spec(audio)
     return result_batch
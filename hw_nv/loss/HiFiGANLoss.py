@@ -1,6 +1,5 @@
 import torch.nn as nn
 import torch
-import torch.nn.functional as F
 
 from hw_nv.preprocessing.mel_spectrogram import MelSpectrogram
 
@@ -14,33 +13,48 @@ class HiFiGANLoss(nn.Module):
         self.fm_loss_lambda = fm_loss_lambda
         self.mel_loss_lambda = mel_loss_lambda
 
+        if hasattr(torch, "compile"):
+            # these two touch the largest tensors (mel STFT, all feature
+            # maps); dynamic=True avoids recompiling on new batch lengths
+            self._mel_loss = torch.compile(self._mel_loss, dynamic=True)
+            self._feature_matching_loss = torch.compile(self._feature_matching_loss, dynamic=True)
+
     def _discriminator_loss(self, disc_gen, disc_gt):
-        loss = 0
-        for i in range(len(disc_gen)):
-            gt_loss = torch.mean(torch.square(disc_gt[i] - 1))
-            gen_loss = torch.mean(torch.square(disc_gen[i]))
-            loss += gt_loss + gen_loss
-        return loss
+        # _foreach_ ops process the whole output list per launch without
+        # materializing the outputs into one concatenated tensor
+        gt_diffs = torch._foreach_sub(disc_gt, 1.0)
+        gt_squares = torch._foreach_mul(gt_diffs, gt_diffs)
+        gen_squares = torch._foreach_mul(disc_gen, disc_gen)
+        gt_loss = torch.stack([square.mean() for square in gt_squares]).sum()
+        gen_loss = torch.stack([square.mean() for square in gen_squares]).sum()
+        return gt_loss + gen_loss
 
     def _generator_loss(self, disc_gen):
-        loss = 0
-        for i in range(len(disc_gen)):
-            loss += torch.mean(torch.square(disc_gen[i] - 1))
-        return loss
+        diffs = torch._foreach_sub(disc_gen, 1.0)
+        squares = torch._foreach_mul(diffs, diffs)
+        return torch.stack([square.mean() for square in squares]).sum()
 
     def _mel_loss(self, audio_gen, mel_gt):
-        mel_gen = self.mel_spectrogram(audio_gen).squeeze(1)
-        if mel_gen.size(2) > mel_gt.size(2):
-            padding_size = mel_gen.size(2) - mel_gt.size(2)
-            mel_gt = F.pad(mel_gt, (0, padding_size))
-        return self.l1_loss(mel_gen, mel_gt)
+        # cuFFT has no bf16 kernels and its fp16 path only takes
+        # power-of-two lengths, so the STFT must run in fp32 even when the
+        # surrounding step is under autocast
+        with torch.autocast(audio_gen.device.type, enabled=False):
+            mel_gen = self.mel_spectrogram(audio_gen.float()).squeeze(1)
+        # collate_fn pads audio to a multiple of hop_length, so the generated
+        # audio yields exactly as many frames as mel_gt; slicing is a no-op
+        # view then, and unlike the old data-dependent F.pad branch it does
+        # not break the compiled graph when lengths drift at inference
+        return self.l1_loss(mel_gen[..., :mel_gt.size(2)], mel_gt)
 
     def _feature_matching_loss(self, features_gen, features_gt):
-        loss = 0
-        for i in range(len(features_gen)):
-            for j in range(len(features_gen[i])):
-                loss += self.l1_loss(features_gen[i][j], features_gt[i][j])
-        return loss
+        # the feature maps are the largest activations of the step, so sum a
+        # stack of per-pair means instead of concatenating everything into
+        # one tensor (which would double peak activation memory)
+        return torch.stack([
+            self.l1_loss(gen, gt)
+            for gen_features, gt_features in zip(features_gen, features_gt)
+            for gen, gt in zip(gen_features, gt_features)
+        ]).sum()
 
     def discriminator_loss(self,
                            mpd_generated, mpd_ground_truth,
@@ -94,9 +94,11 @@ class SubMPD(nn.Module):
 
     def forward(self, x):
         features = []
-        needed_padding = self.period - x.size(2) % self.period
-        x = F.pad(x, (0, needed_padding), "reflect")
+        needed_padding = -x.size(2) % self.period
+        if needed_padding:
+            x = F.pad(x, (0, needed_padding), "reflect")
         x = x.reshape(x.size(0), 1, x.size(2) // self.period, self.period)
+        x = x.contiguous(memory_format=torch.channels_last)
         for module in self.main_convs:
             x = module(x)
             x = F.leaky_relu(x)
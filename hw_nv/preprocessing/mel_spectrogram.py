@@ -2,8 +2,7 @@ from dataclasses import dataclass
 
 import torch
 from torch import nn
-
-import torchaudio
+import torch.nn.functional as F
 
 import librosa
 
@@ -32,20 +31,9 @@ class MelSpectrogram(nn.Module):
             config = MelSpectrogramConfig()
         self.config = config
 
-        self.mel_spectrogram = torchaudio.transforms.MelSpectrogram(
-            sample_rate=config.sr,
-            win_length=config.win_length,
-            hop_length=config.hop_length,
-            n_fft=config.n_fft,
-            f_min=config.f_min,
-            f_max=config.f_max,
-            n_mels=config.n_mels,
-            pad=(config.n_fft - config.hop_length) // 2,
-            center=False
-        )
-
-        # The is no way to set power in constructor in 0.5.0 version.
-        self.mel_spectrogram.spectrogram.power = config.power
+        # Window and filterbank are registered as buffers so they move with
+        # `.to(device)` and stay resident instead of being rebuilt per call.
+        self.register_buffer("window", torch.hann_window(config.win_length))
 
         # Default `torchaudio` mel basis uses HTK formula. In order to be compatible with WaveGlow
         # we decided to use Slaney one instead (as well as `librosa` does by default).
@@ -55,8 +43,8 @@ class MelSpectrogram(nn.Module):
             n_mels=config.n_mels,
             fmin=config.f_min,
             fmax=config.f_max
-        ).T
-        self.mel_spectrogram.mel_scale.fb.copy_(torch.tensor(mel_basis))
+        )
+        self.register_buffer("mel_basis", torch.tensor(mel_basis))
 
     def forward(self, audio: torch.Tensor) -> torch.Tensor:
         """
@@ -64,8 +52,27 @@ class MelSpectrogram(nn.Module):
         :return: Shape is [B, n_mels, T']
         """
 
-        mel = self.mel_spectrogram(audio) \
+        # fold leading dims so [B, 1, T] inputs work the same as [B, T]
+        leading_shape = audio.size()[:-1]
+        audio = audio.reshape(-1, audio.size(-1))
+
+        padding = (self.config.n_fft - self.config.hop_length) // 2
+        audio = F.pad(audio, (padding, padding))
+
+        spectrogram = torch.stft(
+            audio,
+            n_fft=self.config.n_fft,
+            hop_length=self.config.hop_length,
+            win_length=self.config.win_length,
+            window=self.window,
+            center=False,
+            return_complex=True
+        ).abs()
+        if self.config.power != 1.0:
+            spectrogram = spectrogram.pow(self.config.power)
+
+        mel = torch.matmul(self.mel_basis, spectrogram) \
             .clamp_(min=1e-5) \
             .log_()
 
-        return mel
+        return mel.reshape(leading_shape + mel.size()[-2:])
@@ -2,6 +2,7 @@ import unittest
 
 from tqdm import tqdm
 
+from hw_nv.batch_sampler import BucketingSampler
 from hw_nv.collate_fn.collate import collate_fn
 from hw_nv.datasets import LJspeechDataset
 from hw_nv.tests.utils import clear_log_folder_after_use
@@ -26,6 +27,22 @@ class TestDataloader(unittest.TestCase):
             self.assertEqual(batch_size_dim, batch_size)
             self.assertEqual(feature_length_dim, 80)
 
+    def test_bucketing_sampler(self):
+        data_source = list(range(103))
+        batch_size = 8
+        sampler = BucketingSampler(data_source, batch_size=batch_size,
+                                   bucket_size_multiplier=2)
+
+        batches = list(iter(sampler))
+        self.assertEqual(len(batches), len(sampler))
+        self.assertTrue(all(len(batch) <= batch_size for batch in batches))
+        # every item appears exactly once
+        flat = sorted(index for batch in batches for index in batch)
+        self.assertEqual(flat, data_source)
+        # a batch never mixes items further apart than one bucket
+        for batch in batches:
+            self.assertLess(max(batch) - min(batch), sampler.bucket_size)
+
     def test_dataloaders(self):
         _TOTAL_ITERATIONS = 10
         config_parser = ConfigParser.get_test_configs()
@@ -1,4 +1,5 @@
 import random
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from random import shuffle
 import itertools
@@ -70,6 +71,29 @@ class Trainer(BaseTrainer):
         self.generator_lr_scheduler = generator_lr_scheduler
         self.discriminator_lr_scheduler = discriminator_lr_scheduler
         self.log_step = 50
+        self.grad_norm_clip = config["trainer"].get("grad_norm_clip", None)
+
+        # parameter lists are static after construction; cache them instead of
+        # re-walking the module trees on every clip / grad-norm call
+        self._generator_params = list(self.model.generator.parameters())
+        self._discriminator_params = list(
+            itertools.chain(self.model.msd.parameters(), self.model.mpd.parameters())
+        )
+
+        self.use_amp = self.device.type == "cuda" and config["trainer"].get("mixed_precision", True)
+        self.amp_dtype = torch.bfloat16 \
+            if self.use_amp and torch.cuda.is_bf16_supported() else torch.float16
+        # bf16 keeps fp32 exponent range, so loss scaling is only needed for fp16
+        self.scaler = torch.cuda.amp.GradScaler(
+            enabled=self.use_amp and self.amp_dtype == torch.float16
+        )
+
+        # tracker bookkeeping runs on a single worker thread so TensorBoard /
+        # pandas updates stay off the critical path; one worker keeps updates
+        # ordered, and every update goes through it so the trackers are never
+        # mutated from two threads at once
+        self._log_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metrics")
+        self._last_tracker_future = None
 
         self.train_metrics = MetricTracker(
             *DISCRIMINATOR_LOSS_NAMES, *GENERATOR_LOSS_NAMES,
@@ -86,20 +110,18 @@ class Trainer(BaseTrainer):
         Move all necessary tensors to the HPU
         """
         for tensor_for_gpu in ["mel", "audio_gt"]:
-            batch[tensor_for_gpu] = batch[tensor_for_gpu].to(device)
+            batch[tensor_for_gpu] = batch[tensor_for_gpu].to(device, non_blocking=True)
         return batch
 
     def _clip_grad_norm(self, mode):
-        if self.config["trainer"].get("grad_norm_clip", None) is not None:
-            if mode == "generator":
-                clip_grad_norm_(
-                    self.model.generator.parameters(), self.config["trainer"]["grad_norm_clip"]
-                )
-            else:
-                clip_grad_norm_(
-                    itertools.chain(self.model.msd.parameters(), self.model.mpd.parameters()),
-                    self.config["trainer"]["grad_norm_clip"]
-                )
+        if self.grad_norm_clip is None:
+            return
+        if mode == "generator":
+            parameters = self._generator_params
+        else:
+            parameters = self._discriminator_params
+        # foreach clips all grads with a couple of fused launches
+        clip_grad_norm_(parameters, self.grad_norm_clip, foreach=True)
 
     def _train_epoch(self, epoch):
         """
@@ -109,6 +131,7 @@ class Trainer(BaseTrainer):
         :return: A log that contains average loss and metric in this epoch.
         """
         self.model.train()
+        self._flush_tracker_updates()
         self.train_metrics.reset()
         self.writer.add_scalar("epoch", epoch)
         for batch_idx, batch in enumerate(
@@ -134,9 +157,13 @@ class Trainer(BaseTrainer):
                     continue
                 else:
                     raise e
-            self.train_metrics.update("generator grad norm", self.get_grad_norm("generator"))
-            self.train_metrics.update("discriminator grad norm", self.get_grad_norm("discriminator"))
+            self._submit_tracker_update(
+                self.train_metrics,
+                ["generator grad norm", "discriminator grad norm"],
+                [batch["generator_grad_norm"], batch["discriminator_grad_norm"]],
+            )
             if batch_idx % self.log_step == 0:
+                self._flush_tracker_updates()
                 self.writer.set_step((epoch - 1) * self.len_epoch + batch_idx)
                 self.logger.debug(
                     "Train Epoch: {} {} Loss: {:.6f}".format(
@@ -167,47 +194,84 @@ class Trainer(BaseTrainer):
 
         return log
 
+    def _autocast(self):
+        return torch.autocast(self.device.type, dtype=self.amp_dtype, enabled=self.use_amp)
+
     def process_batch(self, batch, is_train: bool, metrics: MetricTracker):
         batch = self.move_batch_to_device(batch, self.device)
-        outputs = self.model.forward_generator(**batch)
-        batch.update(outputs)
+        with self._autocast():
+            outputs = self.model.forward_generator(**batch)
+            batch.update(outputs)
         if is_train:
             self.discriminator_optimizer.zero_grad()
-            outputs = self.model.forward_discriminator(save_data=True, **batch)
-            batch.update(outputs)
-            batch["discriminator_loss"] = self.criterion.discriminator_loss(**batch)
-            batch["discriminator_loss"]["discriminator_loss"].backward()
+            with self._autocast():
+                outputs = self.model.forward_discriminator(save_data=True, **batch)
+                batch.update(outputs)
+                batch["discriminator_loss"] = self.criterion.discriminator_loss(**batch)
+            self.scaler.scale(batch["discriminator_loss"]["discriminator_loss"]).backward()
+            self.scaler.unscale_(self.discriminator_optimizer)
             self._clip_grad_norm("discriminator")
-            self.discriminator_optimizer.step()
+            # measure now: the generator backward below leaks (loss-scaled)
+            # gradients into the discriminator params through the undetached
+            # audio_generated, which would corrupt a later reading
+            batch["discriminator_grad_norm"] = self.get_grad_norm("discriminator")
+            self.scaler.step(self.discriminator_optimizer)
             # if self.discriminator_lr_scheduler is not None:
             #     self.discriminator_lr_scheduler.step()
 
             self.generator_optimizer.zero_grad()
-            outputs = self.model.forward_discriminator(**batch)
-            batch.update(outputs)
-            batch["generator_loss"] = self.criterion.generator_loss(**batch)
-            batch["generator_loss"]["generator_loss"].backward()
+            with self._autocast():
+                outputs = self.model.forward_discriminator(**batch)
+                batch.update(outputs)
+                batch["generator_loss"] = self.criterion.generator_loss(**batch)
+            self.scaler.scale(batch["generator_loss"]["generator_loss"]).backward()
+            self.scaler.unscale_(self.generator_optimizer)
             self._clip_grad_norm("generator")
-            self.generator_optimizer.step()
+            batch["generator_grad_norm"] = self.get_grad_norm("generator")
+            self.scaler.step(self.generator_optimizer)
+            self.scaler.update()
             # if self.generator_lr_scheduler is not None:
             #     self.generator_lr_scheduler.step()
         else:
-            outputs = self.model.forward_discriminator(save_data=True, **batch)
-            batch.update(outputs)
-            batch["discriminator_loss"] = self.criterion.discriminator_loss(**batch)
-            batch["generator_loss"] = self.criterion.generator_loss(**batch)
+            with self._autocast():
+                outputs = self.model.forward_discriminator(save_data=True, **batch)
+                batch.update(outputs)
+                batch["discriminator_loss"] = self.criterion.discriminator_loss(**batch)
+                batch["generator_loss"] = self.criterion.generator_loss(**batch)
 
         batch["generator_loss"]["total_loss"] = batch["generator_loss"]["generator_loss"] + \
                                                 batch["discriminator_loss"]["discriminator_loss"]
 
-        for name in DISCRIMINATOR_LOSS_NAMES:
-            metrics.update(name, batch["discriminator_loss"][name].item())
-        for name in GENERATOR_LOSS_NAMES:
-            metrics.update(name, batch["generator_loss"][name].item())
+        # one stacked transfer instead of a blocking .item() per loss name
+        loss_names = DISCRIMINATOR_LOSS_NAMES + GENERATOR_LOSS_NAMES
+        loss_values = torch.stack(
+            [batch["discriminator_loss"][name].detach() for name in DISCRIMINATOR_LOSS_NAMES] +
+            [batch["generator_loss"][name].detach() for name in GENERATOR_LOSS_NAMES]
+        ).cpu().tolist()
         for met in self.metrics:
-            metrics.update(met.name, met(**batch))
+            loss_names.append(met.name)
+            loss_values.append(met(**batch))
+        self._submit_tracker_update(metrics, loss_names, loss_values)
         return batch
 
+    def _submit_tracker_update(self, metrics: MetricTracker, names, values):
+        self._last_tracker_future = self._log_executor.submit(
+            self._update_tracker, metrics, names, values
+        )
+
+    def _flush_tracker_updates(self):
+        # the single worker runs updates in submission order, so waiting on
+        # the newest future guarantees every earlier one has completed;
+        # must be called before reading or resetting a tracker
+        if self._last_tracker_future is not None:
+            self._last_tracker_future.result()
+            self._last_tracker_future = None
+
+    @staticmethod
+    def _update_tracker(metrics: MetricTracker, names, values):
+        for name, value in zip(names, values):
+            metrics.update(name, value)
+
     def _evaluation_epoch(self, epoch, part, dataloader):
         """
         Validate after training an epoch
@@ -216,6 +280,7 @@ class Trainer(BaseTrainer):
         :return: A log that contains information about validation
         """
         self.model.eval()
+        self._flush_tracker_updates()
         self.evaluation_metrics.reset()
         with torch.no_grad():
             for batch_idx, batch in tqdm(
@@ -228,6 +293,7 @@ class Trainer(BaseTrainer):
                     is_train=False,
                     metrics=self.evaluation_metrics,
                 )
+            self._flush_tracker_updates()
             self.writer.set_step(epoch * self.len_epoch, part)
             self._log_scalars(self.evaluation_metrics)
             if part == "test":
@@ -295,18 +361,14 @@ class Trainer(BaseTrainer):
     @torch.no_grad()
     def get_grad_norm(self, mode, norm_type=2):
         if mode == "generator":
-            parameters = self.model.generator.parameters()
+            parameters = self._generator_params
         else:
-            parameters = itertools.chain(self.model.msd.parameters(), self.model.mpd.parameters())
-        if isinstance(parameters, torch.Tensor):
-            parameters = [parameters]
-        parameters = [p for p in parameters if p.grad is not None]
-        total_norm = torch.norm(
-            torch.stack(
-                [torch.norm(p.grad.detach(), norm_type).cpu() for p in parameters]
-            ),
-            norm_type,
-        )
+            parameters = self._discriminator_params
+        grads = [p.grad.detach() for p in parameters if p.grad is not None]
+        # keep everything on device; only the final scalar crosses to CPU,
+        # so this costs one sync instead of one per parameter
+        norms = torch._foreach_norm(grads, norm_type)
+        total_norm = torch.linalg.vector_norm(torch.stack(norms), norm_type)
         return total_norm.item()
 
     def _log_scalars(self, metric_tracker: MetricTracker):
@@ -315,18 +377,14 @@ class Trainer(BaseTrainer):
         for metric_name in metric_tracker.keys():
             self.writer.add_scalar(f"{metric_name}", metric_tracker.avg(metric_name))
 
-    def _log_audio(self, batch, number):
-        self.writer.add_audio(f"audio_generated_0",
-                              batch['audio_generated'][0, :, :], sample_rate=22050)
-        self.writer.add_audio(f"audio_ground_truth_0",
-                              batch['audio_gt'][0, :, :], sample_rate=22050)
-
-        self.writer.add_audio(f"audio_generated_1",
-                              batch['audio_generated'][1, :, :], sample_rate=22050)
-        self.writer.add_audio(f"audio_ground_truth_1",
-                              batch['audio_gt'][1, :, :], sample_rate=22050)
-
-        self.writer.add_audio(f"audio_generated_2",
-                              batch['audio_generated'][2, :, :], sample_rate=22050)
-        self.writer.add_audio(f"audio_ground_truth_2",
-                              batch['audio_gt'][2, :, :], sample_rate=22050)
+    def _log_audio(self, batch, number, examples_to_log=3):
+        # one device-to-host transfer per tensor instead of one per example;
+        # cast to float since autocast may have produced bf16, which the
+        # writers cannot convert to numpy
+        audio_generated = batch['audio_generated'][:examples_to_log].detach().float().cpu()
+        audio_gt = batch['audio_gt'][:examples_to_log].float().cpu()
+        for i in range(audio_generated.size(0)):
+            self.writer.add_audio(f"audio_generated_{i}",
+                                  audio_generated[i], sample_rate=22050)
+            self.writer.add_audio(f"audio_ground_truth_{i}",
+                                  audio_gt[i], sample_rate=22050)
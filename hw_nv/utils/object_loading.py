@@ -1,5 +1,7 @@
+import os
 from operator import xor
 
+import torch
 from torch.utils.data import ConcatDataset, DataLoader
 
 import hw_nv.augmentations
@@ -13,7 +15,7 @@ from hw_nv.utils.parse_config import ConfigParser
 def get_dataloaders(configs: ConfigParser):
     dataloaders = {}
     for split, params in configs["data"].items():
-        num_workers = params.get("num_workers", 1)
+        num_workers = params.get("num_workers", max(4, (os.cpu_count() or 8) // 2))
 
         # set train augmentations
         if split == 'train':
@@ -54,10 +56,20 @@ def get_dataloaders(configs: ConfigParser):
             f"Batch size ({bs}) shouldn't be larger than dataset length ({len(dataset)})"
 
         # create dataloader
-        dataloader = DataLoader(
-            dataset, batch_size=bs, collate_fn=collate_fn,
-            shuffle=shuffle, num_workers=num_workers,
-            batch_sampler=batch_sampler, drop_last=drop_last
+        loader_kwargs = dict(
+            collate_fn=collate_fn, num_workers=num_workers,
+            pin_memory=torch.cuda.is_available()
         )
+        if batch_sampler is not None:
+            # DataLoader forbids batch_size/shuffle/drop_last alongside a
+            # batch_sampler; batching is entirely the sampler's business then
+            loader_kwargs.update(batch_sampler=batch_sampler)
+        else:
+            loader_kwargs.update(batch_size=bs, shuffle=shuffle, drop_last=drop_last)
+        if num_workers > 0:
+            # keep workers alive between epochs and let them run ahead,
+            # so audio decode + collate hide behind the GPU step
+            loader_kwargs.update(persistent_workers=True, prefetch_factor=4)
+        dataloader = DataLoader(dataset, **loader_kwargs)
         dataloaders[split] = dataloader
     return dataloaders